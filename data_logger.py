@@ -1,31 +1,64 @@
 import gspread
+import streamlit as st
 from oauth2client.service_account import ServiceAccountCredentials
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
+import logging
 
 SHEET_ID = "1KkDjnkKBKETEnBNvERbvjFq22ZtHBrFrkJ14m85UXnc"   # ← replace with your actual sheet ID
 
+SCOPE = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
 
-def log_to_google_sheets(final_archetype, stability, shadow, scores, raw_answers):
+logger = logging.getLogger(__name__)
 
-    scope = [
-        "https://www.googleapis.com/auth/spreadsheets",
-        "https://www.googleapis.com/auth/drive"
-    ]
 
+@st.cache_resource
+def _executor():
+    # Shared across sessions; Sheets calls run here instead of on the script thread
+    return ThreadPoolExecutor(max_workers=2)
+
+
+@st.cache_resource
+def _sheet():
+    # Authorise once per app lifetime instead of on every logged result
     creds = ServiceAccountCredentials.from_json_keyfile_name(
         "service_account.json",
-        scope
+        SCOPE
     )
 
     client = gspread.authorize(creds)
-    sheet = client.open_by_key(SHEET_ID).sheet1
+    return client.open_by_key(SHEET_ID).sheet1
+
+
+def _append_row(row):
+    _sheet().append_row(row)
 
+
+def _log_failure(future):
+    # Runs when the background append finishes; without this a missing
+    # service_account.json, auth or network error would vanish silently
+    exc = future.exception()
+    if exc is not None:
+        logger.error("Google Sheets logging failed", exc_info=exc)
+
+
+def log_to_google_sheets(final_archetype, stability, shadow, scores, raw_answers):
+    """
+    Queue one anonymous result row for the Google Sheet.
+
+    Returns immediately with a Future; the auth and append round-trips
+    happen in a background thread so the results page isn't blocked.
+    Failures are logged rather than raised.
+    """
     shadow_name, shadow_pct = shadow
 
     row = [
         datetime.utcnow().isoformat(),
-        final_str(final_archetype),
+        str(final_archetype),
         round(stability, 2),
         f"{shadow_name} ({round(shadow_pct, 2)}%)",
         scores.get("thinking", 0),
@@ -37,5 +70,6 @@ def log_to_google_sheets(final_archetype, stability, shadow, scores, raw_answers
         json.dumps(raw_answers)
     ]
 
-    sheet.append_row(row)
-
+    future = _executor().submit(_append_row, row)
+    future.add_done_callback(_log_failure)
+    return future
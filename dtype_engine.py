@@ -1,5 +1,25 @@
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Union
+
 import numpy as np
 
+try:
+    import numba
+    from numba import njit, prange
+except ImportError:  # Numba is optional; the NumPy kernel is used instead
+    njit = None
+else:
+    # Streamlit runs scripts off the main thread, and after a parallel call
+    # from such a thread the TBB layer stops the interpreter from exiting.
+    # Calls are serialised below anyway, so the built-in workqueue layer is
+    # enough; an explicit NUMBA_THREADING_LAYER choice is left alone.
+    if numba.config.THREADING_LAYER == "default":
+        numba.config.THREADING_LAYER = "workqueue"
+
 # ============================================================
 # CORE DIMENSIONS FOR D-TYPE
 # ============================================================
@@ -14,6 +34,13 @@ CORE_DIMENSIONS = [
 ]
 
 
+# Dimension name → vector index
+_DIM_INDEX = {dim: i for i, dim in enumerate(CORE_DIMENSIONS)}
+
+# Shared generator for unseeded Monte Carlo runs
+_RNG = np.random.default_rng()
+
+
 # ============================================================
 # SCORE NORMALISATION (LIKERT 1–5 → 0–1)
 # ============================================================
@@ -32,82 +59,175 @@ def normalize_scores(answers: dict) -> dict:
         ...
     }
     """
-    dimension_values = {dim: [] for dim in CORE_DIMENSIONS}
-
-    for _, meta in answers.items():
-        dim = meta.get("dimension")
-        if dim not in CORE_DIMENSIONS:
-            continue
+    metas = [meta for meta in answers.values() if meta.get("dimension") in _DIM_INDEX]
+    n = len(metas)
 
-        val = meta.get("value", 3)
-        reverse = meta.get("reverse", False)
+    dim_ids = np.fromiter((_DIM_INDEX[meta["dimension"]] for meta in metas), dtype=np.intp, count=n)
+    vals = np.fromiter((meta.get("value", 3) for meta in metas), dtype=float, count=n)
+    reverse = np.fromiter((bool(meta.get("reverse", False)) for meta in metas), dtype=bool, count=n)
 
-        # reverse-scoring: 1 ↔ 5
-        if reverse:
-            val = 6 - val
+    # reverse-scoring: 1 ↔ 5
+    vals = np.where(reverse, 6 - vals, vals)
 
-        dimension_values[dim].append(val)
+    # Per-dimension mean in one pass
+    sums = np.bincount(dim_ids, weights=vals, minlength=len(CORE_DIMENSIONS))
+    counts = np.bincount(dim_ids, minlength=len(CORE_DIMENSIONS))
+    avg = sums / np.maximum(counts, 1)  # 1–5
 
-    final_scores = {}
-    for dim, vals in dimension_values.items():
-        if not vals:
-            # Neutral default (midpoint 0.5) if dimension has no items
-            final_scores[dim] = 0.5
-        else:
-            avg = sum(vals) / len(vals)  # 1–5
-            # map 1–5 → 0–1
-            final_scores[dim] = (avg - 1.0) / 4.0
+    # map 1–5 → 0–1, neutral default (midpoint 0.5) if dimension has no items
+    final_scores = np.where(counts > 0, (avg - 1.0) / 4.0, 0.5)
 
-    return final_scores
+    return dict(zip(CORE_DIMENSIONS, final_scores.tolist()))
 
 
 # ============================================================
 # ARCHETYPE HELPERS
 # ============================================================
 
-def _build_archetype_vector(archetype: dict) -> np.ndarray:
+# 'Ideal' behaviour value per tier level, describing the PATTERN of each
+# archetype in 0–1 space: primary dimensions 1.0, secondary 0.7, tertiary
+# 0.4, and unlisted ones neutral-ish 0.5. Indexed by tier level:
+# 0 = unlisted, 1 = tertiary, 2 = secondary, 3 = primary.
+_TIER_VALUES = np.array([0.5, 0.4, 0.7, 1.0], dtype=np.float32)
+
+
+class _ArchetypeTables(NamedTuple):
     """
-    Build an 'ideal' behaviour vector for the archetype in 0–1 space.
+    All archetypes stacked as matrices, rows in `names` order:
 
-    Convention:
-      - Primary dimensions: 1.0
-      - Secondary:          0.7
-      - Tertiary:           0.4
+      names:     tuple of archetype names
+      arche_mat: (A, D) archetype pattern vectors
+      w_mat:     (A, D) dimension weights
+      wa_mat:    (A, D) w_mat * arche_mat (similarity coefficients)
+      tiers:     (A, D) int8 tier level per dimension (see _TIER_VALUES)
 
-    This describes the PATTERN of each archetype.
+    Matrices are float32: the values are coarse 0–1 levels, and the Monte
+    Carlo path is memory-bound, so half-width floats halve its traffic.
     """
-    primary = set(archetype.get("primary_dimensions", []))
-    secondary = set(archetype.get("secondary_dimensions", []))
-    tertiary = set(archetype.get("tertiary_dimensions", []))
+    names: tuple
+    arche_mat: np.ndarray
+    w_mat: np.ndarray
+    wa_mat: np.ndarray
+    tiers: np.ndarray
 
-    vec = []
-    for dim in CORE_DIMENSIONS:
-        if dim in primary:
-            vec.append(1.0)
-        elif dim in secondary:
-            vec.append(0.7)
-        elif dim in tertiary:
-            vec.append(0.4)
-        else:
-            # if somehow not listed, treat as neutral-ish
-            vec.append(0.5)
-    return np.array(vec, dtype=float)
 
+def _build_archetype_matrix(archetypes: dict) -> _ArchetypeTables:
+    """
+    Stack every archetype's pattern vector and weights into matrices so all
+    archetypes can be scored against a profile in one vectorised pass.
+    """
+    names = tuple(archetypes.keys())
+    shape = (len(names), len(CORE_DIMENSIONS))
+
+    tiers = np.zeros(shape, dtype=np.int8)
+    w_mat = np.zeros(shape, dtype=np.float32)
+
+    for row, name in enumerate(names):
+        data = archetypes[name]
+
+        # Lowest tier first, so a dimension listed twice keeps its highest tier
+        for level, key in ((1, "tertiary_dimensions"),
+                           (2, "secondary_dimensions"),
+                           (3, "primary_dimensions")):
+            cols = [_DIM_INDEX[dim] for dim in data.get(key, []) if dim in _DIM_INDEX]
+            tiers[row, cols] = level
 
-def _extract_weight_vector(archetype: dict) -> np.ndarray:
+        for dim, weight in data.get("dimension_weights", {}).items():
+            if dim in _DIM_INDEX:
+                w_mat[row, _DIM_INDEX[dim]] = float(weight)
+
+    arche_mat = _TIER_VALUES[tiers]
+    wa_mat = w_mat * arche_mat
+
+    # Tables are shared through the cache below, so freeze them
+    for mat in (arche_mat, w_mat, wa_mat, tiers):
+        mat.setflags(write=False)
+
+    return _ArchetypeTables(names, arche_mat, w_mat, wa_mat, tiers)
+
+
+# Archetype matrices depend only on the loaded archetypes.json, so keep the
+# last few builds. Lookups go by dict identity first; each entry holds the
+# dict itself, which stops its id() being reused while cached. On an
+# identity miss the dict's content hash is tried, so a re-loaded copy of
+# the same JSON reuses the existing tables. Archetype dicts are treated as
+# read-only once loaded.
+_MATRIX_CACHE_SIZE = 4
+_matrix_cache = OrderedDict()
+_matrix_cache_by_hash = OrderedDict()
+
+
+def _archetypes_hash(archetypes: dict) -> bytes:
+    """
+    Content hash of an archetypes dict. Archetype order is part of the key,
+    since it fixes the table row order (and with it tie-breaking and result
+    order); key order inside each archetype's data is not.
     """
-    Extract numerical weights per dimension from archetype["dimension_weights"].
+    blob = json.dumps([list(archetypes), archetypes], sort_keys=True, default=str).encode()
+    return hashlib.blake2b(blob, digest_size=16).digest()
 
-    Falls back to 0.0 if a dimension is missing (should not happen if JSON is correct).
+
+def _cache_put(cache: OrderedDict, key, value):
+    cache[key] = value
+    cache.move_to_end(key)
+    if len(cache) > _MATRIX_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def _archetype_matrix(archetypes: dict) -> _ArchetypeTables:
+    """
+    Cached _build_archetype_matrix(): rebuilt only for new archetype content.
     """
-    w_dict = archetype.get("dimension_weights", {})
-    return np.array([float(w_dict.get(dim, 0.0)) for dim in CORE_DIMENSIONS], dtype=float)
+    key = id(archetypes)
+    entry = _matrix_cache.get(key)
+    if entry is not None and entry[0] is archetypes:
+        _matrix_cache.move_to_end(key)
+        return entry[1]
+
+    content_key = _archetypes_hash(archetypes)
+    tables = _matrix_cache_by_hash.get(content_key)
+    if tables is None:
+        tables = _build_archetype_matrix(archetypes)
+    _cache_put(_matrix_cache_by_hash, content_key, tables)
+
+    _cache_put(_matrix_cache, key, (archetypes, tables))
+    return tables
 
 
 # ============================================================
 # WEIGHTED DISTANCE & SIMILARITY (PHYSICS-STYLE)
 # ============================================================
 
+def _hybrid_score_sq(user_vec: np.ndarray,
+                     arche_vec: np.ndarray,
+                     weight_vec: np.ndarray):
+    """
+    Similarity and *squared* weighted distance for one archetype, from a
+    single diff.
+
+    Returns:
+        (sim, sq_dist)
+    """
+    diff = user_vec - arche_vec
+    sim = np.einsum("d,d,d->", weight_vec, user_vec, arche_vec)
+    sq_dist = np.einsum("d,d,d->", weight_vec, diff, diff)
+    return sim, sq_dist
+
+
+def _score_pair(user_vec: np.ndarray,
+                arche_vec: np.ndarray,
+                weight_vec: np.ndarray):
+    """
+    Weighted distance and similarity for one archetype, computed together
+    from a single diff (no intermediate weight products).
+
+    Returns:
+        (dist, sim)
+    """
+    sim, sq_dist = _hybrid_score_sq(user_vec, arche_vec, weight_vec)
+    return math.sqrt(sq_dist), sim
+
+
 def _weighted_distance(user_vec: np.ndarray,
                        arche_vec: np.ndarray,
                        weight_vec: np.ndarray) -> float:
@@ -115,8 +235,7 @@ def _weighted_distance(user_vec: np.ndarray,
     Weighted Euclidean distance.
     Lower distance = closer behavioural match.
     """
-    diff = user_vec - arche_vec
-    return float(np.sqrt(np.sum(weight_vec * (diff ** 2))))
+    return _score_pair(user_vec, arche_vec, weight_vec)[0]
 
 
 def _weighted_similarity(user_vec: np.ndarray,
@@ -126,7 +245,7 @@ def _weighted_similarity(user_vec: np.ndarray,
     Weighted dot-product similarity.
     Higher similarity = stronger alignment with archetype pattern.
     """
-    return float(np.sum(weight_vec * user_vec * arche_vec))
+    return _score_pair(user_vec, arche_vec, weight_vec)[1]
 
 
 def _hybrid_score(user_vec: np.ndarray,
@@ -139,20 +258,61 @@ def _hybrid_score(user_vec: np.ndarray,
 
     Higher score → better archetype fit.
     """
-    dist = _weighted_distance(user_vec, arche_vec, weight_vec)
-    sim = _weighted_similarity(user_vec, arche_vec, weight_vec)
+    dist, sim = _score_pair(user_vec, arche_vec, weight_vec)
     return sim - dist
 
 
+def _hybrid_terms(user_vec: np.ndarray, tables: _ArchetypeTables):
+    """
+    Weighted distance and similarity of one profile against every archetype.
+
+    Returns:
+        (dist, sim), each shape (A,)
+    """
+    diff = tables.arche_mat - user_vec
+    dist = np.sqrt(np.einsum("ad,ad,ad->a", tables.w_mat, diff, diff))
+    sim = tables.wa_mat @ user_vec
+    return dist, sim
+
+
+def _final_scores_to_vec(final_scores: Union[dict, np.ndarray]) -> np.ndarray:
+    """
+    User profile as a (D,) float32 vector in CORE_DIMENSIONS order.
+
+    Accepts the dict from normalize_scores() (missing dimensions → 0.5) or
+    an already-built vector, which is passed through without copying.
+    """
+    if isinstance(final_scores, np.ndarray):
+        return final_scores.astype(np.float32, copy=False)
+    return np.array([final_scores.get(dim, 0.5) for dim in CORE_DIMENSIONS], dtype=np.float32)
+
+
+# Scores this close count as tied. Likert answers are discrete, so
+# different archetypes often score exactly the same (the all-neutral
+# default profile is one such tie); float32 rounding would otherwise break
+# those ties arbitrarily instead of in archetype order.
+_TIE_EPS = 1e-5
+
+
+def _first_best(scores: np.ndarray) -> np.ndarray:
+    """
+    Argmax along the last axis, treating scores within _TIE_EPS of the best
+    as tied: the first such archetype wins.
+    """
+    best = scores.max(axis=-1, keepdims=True)
+    return (scores >= best - _TIE_EPS).argmax(axis=-1)
+
+
 # ============================================================
 # PRIMARY ARCHETYPE MATCHING
 # ============================================================
 
-def determine_archetype(final_scores: dict, archetypes: dict):
+def determine_archetype(final_scores: Union[dict, np.ndarray], archetypes: dict):
     """
     Determine the best-fitting D-Type archetype.
 
     final_scores: normalised 0–1 dict from normalize_scores()
+                  (or a vector from _final_scores_to_vec())
     archetypes:   dict loaded from archetypes.json
 
     Returns:
@@ -161,29 +321,61 @@ def determine_archetype(final_scores: dict, archetypes: dict):
     if not archetypes:
         return None, {}
 
-    user_vec = np.array([final_scores.get(dim, 0.5) for dim in CORE_DIMENSIONS], dtype=float)
+    user_vec = _final_scores_to_vec(final_scores)
 
-    best_name = None
-    best_score = -1e9
+    tables = _archetype_matrix(archetypes)
 
-    for name, data in archetypes.items():
-        arche_vec = _build_archetype_vector(data)
-        w_vec = _extract_weight_vector(data)
+    # Hybrid score against every archetype at once: shape (A,)
+    dist, sim = _hybrid_terms(user_vec, tables)
 
-        score = _hybrid_score(user_vec, arche_vec, w_vec)
-
-        if score > best_score:
-            best_score = score
-            best_name = name
+    best_name = tables.names[int(_first_best(sim - dist))]
 
     return best_name, archetypes.get(best_name, {})
 
 
+def determine_archetype_batch(score_dicts, archetypes: dict):
+    """
+    determine_archetype() for many users at once.
+
+    score_dicts: list of normalize_scores() dicts, a dict of them keyed by
+                 user, or an (N, D) array of profile vectors
+    archetypes:  dict loaded from archetypes.json
+
+    Returns:
+        list of (primary_name, archetype_data_dict), one per user in input
+        order — or a dict with the same keys when given a dict
+    """
+    keys = None
+    if isinstance(score_dicts, dict):
+        keys = list(score_dicts)
+        score_dicts = list(score_dicts.values())
+
+    if not archetypes or len(score_dicts) == 0:
+        results = [(None, {})] * len(score_dicts)
+    else:
+        if isinstance(score_dicts, np.ndarray):
+            user_mat = score_dicts.astype(np.float32, copy=False)
+        else:
+            user_mat = np.stack([_final_scores_to_vec(s) for s in score_dicts])
+
+        tables = _archetype_matrix(archetypes)
+
+        # One broadcast over all users: (N, D) against (A, D)
+        winners = _mc_winners_numpy(user_mat, tables.arche_mat, tables.w_mat, tables.wa_mat)
+
+        results = [
+            (name, archetypes.get(name, {}))
+            for name in (tables.names[i] for i in winners.tolist())
+        ]
+
+    return dict(zip(keys, results)) if keys is not None else results
+
+
 # ============================================================
 # DIAGNOSTIC DISTANCES (OPTIONAL)
 # ============================================================
 
-def compute_archetype_distances(final_scores: dict, archetypes: dict) -> dict:
+def compute_archetype_distances(final_scores: Union[dict, np.ndarray], archetypes: dict) -> dict:
     """
     For diagnostics / analytics / debugging.
 
@@ -194,23 +386,14 @@ def compute_archetype_distances(final_scores: dict, archetypes: dict) -> dict:
         "hybrid": {name: score, ...}
       }
     """
-    user_vec = np.array([final_scores.get(dim, 0.5) for dim in CORE_DIMENSIONS], dtype=float)
+    user_vec = _final_scores_to_vec(final_scores)
 
-    distances = {}
-    similarities = {}
-    hybrids = {}
+    tables = _archetype_matrix(archetypes)
+    dist, sim = _hybrid_terms(user_vec, tables)
 
-    for name, data in archetypes.items():
-        arche_vec = _build_archetype_vector(data)
-        w_vec = _extract_weight_vector(data)
-
-        d = _weighted_distance(user_vec, arche_vec, w_vec)
-        s = _weighted_similarity(user_vec, arche_vec, w_vec)
-        h = s - d
-
-        distances[name] = d
-        similarities[name] = s
-        hybrids[name] = h
+    distances = dict(zip(tables.names, dist.tolist()))
+    similarities = dict(zip(tables.names, sim.tolist()))
+    hybrids = dict(zip(tables.names, (sim - dist).tolist()))
 
     return {
         "distance": distances,
@@ -219,15 +402,145 @@ def compute_archetype_distances(final_scores: dict, archetypes: dict) -> dict:
     }
 
 
+# ============================================================
+# MONTE CARLO KERNELS
+# ============================================================
+
+def _mc_winners_numpy(noisy: np.ndarray,
+                      arche_mat: np.ndarray,
+                      w_mat: np.ndarray,
+                      wa_mat: np.ndarray) -> np.ndarray:
+    """
+    Index of the best hybrid-score archetype for each noisy profile.
+
+    noisy: (T, D) profiles; arche_mat / w_mat / wa_mat: (A, D) tables from
+    _ArchetypeTables. Returns (T,) ints.
+    Ties go to the first archetype, as in determine_archetype().
+    """
+    # Hybrid score (similarity - distance) for every trial/archetype pair: shape (T, A)
+    diff = noisy[:, None, :] - arche_mat[None, :, :]
+    diff *= diff
+    dist = np.sqrt(np.einsum("tad,ad->ta", diff, w_mat))
+    sim = noisy @ wa_mat.T
+    return _first_best(sim - dist)
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _mc_winners_numba(noisy, arche_mat, w_mat, wa_mat, out_winners):
+        """
+        Numba version of _mc_winners_numpy(): fuses distance, similarity and
+        argmax per trial, so the (T, A, D) temporary is never allocated.
+        Trials run in parallel across cores; noisy is clamped to [0, 1] in
+        place and winners go into out_winners.
+        """
+        trials, dims = noisy.shape
+        n_arche = arche_mat.shape[0]
+
+        for t in prange(trials):
+            # Clamp this trial's profile to [0, 1] in the same pass
+            for k in range(dims):
+                noisy[t, k] = min(max(noisy[t, k], 0.0), 1.0)
+
+            best_score = -1e18
+            for a in range(n_arche):
+                sim = 0.0
+                sq_dist = 0.0
+                for k in range(dims):
+                    diff = noisy[t, k] - arche_mat[a, k]
+                    sq_dist += w_mat[a, k] * diff * diff
+                    sim += wa_mat[a, k] * noisy[t, k]
+                best_score = max(best_score, sim - math.sqrt(sq_dist))
+
+            # Second pass: first archetype within _TIE_EPS of the best, as in
+            # _first_best(). Rescoring is cheaper than keeping a (T, A) buffer.
+            for a in range(n_arche):
+                sim = 0.0
+                sq_dist = 0.0
+                for k in range(dims):
+                    diff = noisy[t, k] - arche_mat[a, k]
+                    sq_dist += w_mat[a, k] * diff * diff
+                    sim += wa_mat[a, k] * noisy[t, k]
+                if sim - math.sqrt(sq_dist) >= best_score - _TIE_EPS:
+                    out_winners[t] = a
+                    break
+else:
+    _mc_winners_numba = None
+
+# Streamlit runs each session's script on its own thread. The "workqueue"
+# threading layer (pinned above) aborts the whole process if two parallel
+# kernels run at once, so calls into the kernel are serialised.
+_NUMBA_LOCK = threading.Lock()
+
+
+def _mc_winners(noisy: np.ndarray, tables: _ArchetypeTables) -> np.ndarray:
+    """
+    Winning archetype index per noisy profile, using the Numba kernel when
+    available and the NumPy broadcast otherwise.
+
+    noisy is the raw (T, D) sample; it is clipped to [0, 1] in place.
+    """
+    if _mc_winners_numba is None:
+        np.clip(noisy, 0.0, 1.0, out=noisy)
+        return _mc_winners_numpy(noisy, tables.arche_mat, tables.w_mat, tables.wa_mat)
+
+    winners = np.empty(len(noisy), dtype=np.int32)
+    with _NUMBA_LOCK:
+        _mc_winners_numba(noisy, tables.arche_mat, tables.w_mat, tables.wa_mat, winners)
+    return winners
+
+
+def _analytic_probabilities(user_vec: np.ndarray,
+                            tables: _ArchetypeTables,
+                            noise: float) -> np.ndarray:
+    """
+    Closed-form stand-in for the Monte Carlo estimate: a softmax over the
+    hybrid scores at the user's true profile.
+
+    Linearising each score around user_vec, the chance that archetype a
+    beats b under N(0, noise²) noise is Φ((h_a - h_b) / (noise·|g_a - g_b|)),
+    with g the score gradients. Using the logistic approximation to Φ and
+    the mean |g_a - g_b| over all pairs gives one softmax temperature:
+
+        p ∝ exp(h / T),   T = noise · mean|g_a - g_b| / 1.702
+
+    This ignores clipping at the [0, 1] bounds and the curvature of the
+    distance term; against 40k-trial runs its mean total-variation error
+    was ~0.1, so the sampled estimate remains the default. Returns (A,)
+    fractions summing to 1.
+    """
+    dist, sim = _hybrid_terms(user_vec, tables)
+    scores = sim - dist
+
+    # d(score)/d(user_vec) per archetype: shape (A, D)
+    diff = user_vec - tables.arche_mat
+    grads = tables.wa_mat - tables.w_mat * diff / np.maximum(dist, 1e-12)[:, None]
+
+    n = len(scores)
+    pair_i, pair_j = np.triu_indices(n, k=1)
+    spread = np.linalg.norm(grads[pair_i] - grads[pair_j], axis=1).mean() if n > 1 else 0.0
+    temperature = noise * spread / 1.702
+
+    if temperature <= 0.0:
+        fractions = np.zeros(n)
+        fractions[_first_best(scores)] = 1.0
+        return fractions
+
+    weights = np.exp((scores - scores.max()) / temperature)
+    return weights / weights.sum()
+
+
 # ============================================================
 # MONTE CARLO PROBABILITIES (SHADOW ARCHETYPE, STABILITY)
 # ============================================================
 
 def monte_carlo_probabilities(
-    final_scores: dict,
+    final_scores: Union[dict, np.ndarray],
     archetypes: dict,
     trials: int = 4000,
     noise: float = 0.08,
+    seed: Optional[int] = None,
+    use_analytic: bool = False,
 ):
     """
     Run many noisy simulations of the user's 6D profile to estimate:
@@ -236,10 +549,14 @@ def monte_carlo_probabilities(
       - stability of the primary archetype
       - shadow archetype (second-strongest)
 
-    final_scores: normalised 0–1 scores
+    final_scores: normalised 0–1 scores (dict or vector, as in determine_archetype)
     archetypes:   dict from archetypes.json
     trials:       number of Monte Carlo samples
     noise:        std dev of Gaussian noise in 0–1 space
+    seed:         RNG seed; pass one for reproducible (cacheable) results
+    use_analytic: skip sampling and use the closed-form softmax estimate
+                  from _analytic_probabilities() (deterministic, but only
+                  approximate — see its docstring)
 
     Returns:
         probs:    {archetype_name: probability_percentage}
@@ -249,50 +566,69 @@ def monte_carlo_probabilities(
     if not archetypes:
         return {}, 0.0, ("None", 0.0)
 
-    user_vec = np.array([final_scores.get(dim, 0.5) for dim in CORE_DIMENSIONS], dtype=float)
-
-    # Pre-build archetype vectors & weights for speed
-    arche_data = {}
-    for name, data in archetypes.items():
-        arche_vec = _build_archetype_vector(data)
-        w_vec = _extract_weight_vector(data)
-        arche_data[name] = (arche_vec, w_vec)
-
-    counts = {name: 0 for name in archetypes.keys()}
-    arche_names = list(archetypes.keys())
+    user_vec = _final_scores_to_vec(final_scores)
 
-    for _ in range(trials):
-        # Add Gaussian noise around the user's true vector
-        noisy_vec = user_vec + np.random.normal(0.0, noise, size=len(CORE_DIMENSIONS))
+    # Archetype vectors & weights as (A, D) matrices
+    tables = _archetype_matrix(archetypes)
+    arche_names = tables.names
 
-        # Clip to [0, 1] to avoid runaway values
-        noisy_vec = np.clip(noisy_vec, 0.0, 1.0)
+    if use_analytic:
+        fractions = _analytic_probabilities(user_vec, tables, noise)
+    else:
+        # Draw every trial at once: Gaussian noise around the user's true
+        # vector, built in place in one (T, D) buffer
+        rng = _RNG if seed is None else np.random.default_rng(seed)
+        noisy = rng.standard_normal((trials, len(CORE_DIMENSIONS)), dtype=np.float32)
+        noisy *= np.float32(noise)
+        noisy += user_vec
+
+        # Winning archetype per trial (profiles clipped to [0, 1] to avoid
+        # runaway values), then tally
+        winners = _mc_winners(noisy, tables)
+        fractions = np.bincount(winners, minlength=len(arche_names)) / trials
+
+    # Convert fractions → percentages
+    probs = dict(zip(arche_names, (fractions * 100.0).tolist()))
+
+    # Primary archetype = highest probability (first one on ties)
+    primary_i = int(fractions.argmax())
+    primary_name = arche_names[primary_i]
+    stability = probs[primary_name]
 
-        best_name = None
-        best_score = -1e9
+    # Shadow archetype = second highest (if exists): O(A), no full sort
+    if len(arche_names) > 1:
+        rest = fractions.copy()
+        rest[primary_i] = -np.inf
+        shadow_name = arche_names[int(rest.argmax())]
+        shadow_pct = probs[shadow_name]
+    else:
+        shadow_name, shadow_pct = primary_name, stability
 
-        for name in arche_names:
-            arche_vec, w_vec = arche_data[name]
-            score = _hybrid_score(noisy_vec, arche_vec, w_vec)
+    return probs, stability, (shadow_name, shadow_pct)
 
-            if score > best_score:
-                best_score = score
-                best_name = name
 
-        counts[best_name] += 1
+# ============================================================
+# FULL PROFILE SCORING
+# ============================================================
 
-    # Convert counts → percentages
-    probs = {name: (count / trials) * 100.0 for name, count in counts.items()}
+def score_profile(final_scores: Union[dict, np.ndarray], archetypes: dict, **mc_kwargs) -> dict:
+    """
+    Run the whole scoring chain for one profile, building the user vector
+    once and reusing it for every step.
 
-    # Primary archetype = highest probability
-    primary_name = max(probs, key=probs.get)
-    stability = probs[primary_name]
+    mc_kwargs are passed to monte_carlo_probabilities() (trials, noise, seed, ...).
 
-    # Shadow archetype = second highest (if exists)
-    sorted_probs = sorted(probs.items(), key=lambda x: x[1], reverse=True)
-    if len(sorted_probs) > 1:
-        shadow_name, shadow_pct = sorted_probs[1]
-    else:
-        shadow_name, shadow_pct = primary_name, stability
+    Returns:
+      {
+        "primary": (primary_name, archetype_data_dict),
+        "diagnostics": compute_archetype_distances() result,
+        "monte_carlo": (probs, stability, (shadow_name, shadow_pct))
+      }
+    """
+    user_vec = _final_scores_to_vec(final_scores)
 
-    return probs, stability, (shadow_name, shadow_pct)
+    return {
+        "primary": determine_archetype(user_vec, archetypes),
+        "diagnostics": compute_archetype_distances(user_vec, archetypes),
+        "monte_carlo": monte_carlo_probabilities(user_vec, archetypes, **mc_kwargs),
+    }
@@ -0,0 +1,302 @@
+import functools
+
+import numpy as np
+import streamlit as st
+import orjson
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Shared page pieces. Streamlit only re-executes the entry script on a rerun;
+# this module is imported once, so its definitions (and caches) persist.
+
+# Serialise figures with orjson (much faster than stdlib json)
+pio.json.config.default_engine = "orjson"
+
+
+# ============================================================
+# SESSION STATE INITIALISATION
+# ============================================================
+
+def init_state():
+    defaults = {
+        "step": 1,
+        "has_results": False,
+        "open_archetype": None,
+        "answers": {}
+    }
+    for key, val in defaults.items():
+        st.session_state.setdefault(key, val)
+
+
+# ============================================================
+# LOAD CSS
+# ============================================================
+
+# File contents are read once per app lifetime; only the <style> tag is
+# re-emitted on each rerun
+@st.cache_resource
+def load_css_text(path="assets/styles.css"):
+    try:
+        with open(path) as f:
+            return f.read()
+    except:
+        return ""
+
+def load_css():
+    css = load_css_text()
+    if css:
+        st.markdown(f"<style>{css}</style>", unsafe_allow_html=True)
+
+
+# ============================================================
+# JSON HELPERS
+# ============================================================
+
+@st.cache_data
+def load_json(path, default=None):
+    try:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    except:
+        return default
+
+@st.cache_resource
+def load_archetypes(path="data/archetypes.json"):
+    # Shared (not copied) across reruns, so the engine's cached archetype
+    # matrices are built once per app lifetime instead of on every click
+    return load_json(path, default={})
+
+
+# ============================================================
+# CHART BUILDERS
+# ============================================================
+
+# Figures are cached on their (hashable) inputs, so reruns with the same
+# results skip rebuilding them
+
+@st.cache_data
+def build_radar(vals, dims):
+    # Radar chart — scores mapped 0–1 → 0–100 visually
+    vals = list(vals)
+    dims = list(dims)
+
+    radar = go.Figure()
+    radar.add_trace(go.Scatterpolar(
+        r=vals + [vals[0]],
+        theta=dims + [dims[0]],
+        fill='toself',
+        fillcolor='rgba(0,234,255,0.25)',
+        line_color='#00eaff',
+        line_width=3
+    ))
+
+    radar.update_layout(
+        polar=dict(radialaxis=dict(range=[0, 100])),
+        showlegend=False,
+        paper_bgcolor='rgba(0,0,0,0)'
+    )
+    return radar
+
+@functools.lru_cache(maxsize=4)
+def heat_index(names, heat_grid):
+    # (3, 3) positions of each grid archetype in `names`; archetypes missing
+    # from the results point at an extra trailing slot that holds 0
+    pos = {name: i for i, name in enumerate(names)}
+    return np.array([[pos.get(a, len(names)) for a in row] for row in heat_grid])
+
+@st.cache_data
+def build_heatmap(probs_items, heat_grid):
+    names = tuple(name for name, _ in probs_items)
+    probs_arr = np.array([pct for _, pct in probs_items] + [0.0])
+
+    heat_values = probs_arr[heat_index(names, heat_grid)].tolist()
+
+    heat = go.Figure(data=go.Heatmap(
+        z=heat_values,
+        x=["A1", "A2", "A3"],
+        y=["B1", "B2", "B3"],
+        colorscale="blues",
+        showscale=True,
+        hoverinfo="skip"
+    ))
+
+    annotations = [
+        dict(
+            x=j,
+            y=i,
+            text=f"<b>{a}</b><br>{pct:.1f}%",
+            showarrow=False,
+            font=dict(color="black", size=12)
+        )
+        for i, (row, pcts) in enumerate(zip(heat_grid, heat_values))
+        for j, (a, pct) in enumerate(zip(row, pcts))
+    ]
+
+    heat.update_layout(
+        annotations=annotations,
+        paper_bgcolor="rgba(0,0,0,0)"
+    )
+    return heat
+
+
+# ============================================================
+# HERO BANNER & STEP PROGRESS BAR
+# ============================================================
+
+def render_hero(title, sub):
+    st.markdown(f"""
+<div class="hero-wrapper">
+<div class="hero">
+<div class="hero-glow"></div>
+<div class="hero-particles"></div>
+<div class="hero-content">
+<h1 class="hero-title">{title}</h1>
+<p class="hero-sub">{sub}</p>
+</div>
+</div>
+</div>
+""", unsafe_allow_html=True)
+
+def render_progress(step, labels):
+    st.markdown(f"### {labels[step]}")
+    st.progress(step / len(labels))
+
+
+# ============================================================
+# QUESTIONNAIRE
+# ============================================================
+
+def render_question_form(questions):
+    st.markdown("""
+    <div class="likert-legend">
+    <span>1 = Strongly Disagree</span>
+    <span>5 = Strongly Agree</span>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Sliders live in a form, so dragging them doesn't rerun the script;
+    # answers are collected in one go when the form is submitted
+    with st.form("questionnaire"):
+        for i, q in enumerate(questions):
+            st.markdown(f"<p><b>{q['question']}</b></p>", unsafe_allow_html=True)
+
+            st.slider(
+                "", 1, 5,
+                st.session_state["answers"].get(f"q{i}", 3),
+                key=f"slider_{i}"
+            )
+
+            st.markdown("<hr>", unsafe_allow_html=True)
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            def reset():
+                st.session_state["answers"] = {}
+                st.session_state["step"] = 1
+                st.session_state["has_results"] = False
+
+            st.form_submit_button("Reset", on_click=reset)
+
+        with col2:
+            def go_next():
+                st.session_state["answers"] = {
+                    f"q{i}": st.session_state[f"slider_{i}"]
+                    for i in range(len(questions))
+                }
+                st.session_state["step"] = 2
+
+            st.form_submit_button("Next ➜ Results", on_click=go_next)
+
+def get_answers(questions_list):
+    answers = {}
+    for i, q in enumerate(questions_list):
+        key = f"q{i}"
+        val = st.session_state["answers"].get(key, 3)
+
+        answers[str(q["id"])] = {
+            "value": val,
+            "dimension": q["dimension"],
+            "reverse": q.get("reverse", False)
+        }
+    return answers
+
+
+# ============================================================
+# RESULTS DISPLAY
+# ============================================================
+
+def render_results(primary_name, archetype_data, final_scores, probs, stability, shadow,
+                   dims, heat_grid):
+    shadow_name, shadow_pct = shadow
+
+    # --------------------------------------------------------
+    # RESULT CARD
+    # --------------------------------------------------------
+
+    st.markdown(f"""
+    <div class="itype-result-card">
+    <h1>{primary_name}</h1>
+    <p>{archetype_data.get("description","")}</p>
+    <p><b>Stability:</b> {stability:.1f}%</p>
+    <p><b>Shadow:</b> {shadow_name} ({shadow_pct:.1f}%)</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # --------------------------------------------------------
+    # RADAR CHART — MAP 0–1 → 0–100 VISUALLY
+    # --------------------------------------------------------
+
+    vals = [final_scores[d] * 100 for d in dims]
+    st.plotly_chart(build_radar(tuple(vals), tuple(dims)), use_container_width=True)
+
+    # --------------------------------------------------------
+    # HEATMAP (3×3 ARCHETYPE GRID)
+    # --------------------------------------------------------
+
+    st.plotly_chart(build_heatmap(tuple(sorted(probs.items())), heat_grid), use_container_width=True)
+
+    # --------------------------------------------------------
+    # STRENGTHS / BLINDSPOTS
+    # --------------------------------------------------------
+
+    st.subheader("Strengths")
+    for s in archetype_data.get("strengths", []):
+        st.write(f"- {s}")
+
+    st.subheader("Blindspots")
+    for r in archetype_data.get("blindspots", []):
+        st.write(f"- {r}")
+
+
+# ============================================================
+# ARCHETYPE EXPLORER
+# ============================================================
+
+# Runs as a fragment: clicking an archetype reruns only this block, not the
+# whole script (and leaves the results above on screen)
+@st.fragment
+def archetype_explorer(archetypes):
+    st.markdown("## Explore All Archetypes")
+    cols = st.columns(3)
+
+    for idx, name in enumerate(archetypes.keys()):
+        with cols[idx % 3]:
+            if st.button(name, key=f"btn_{name}"):
+                st.session_state["open_archetype"] = (
+                    None if st.session_state["open_archetype"] == name else name
+                )
+
+    selected = st.session_state["open_archetype"]
+    if selected:
+        info = archetypes[selected]
+        st.markdown(f"### {selected}")
+        st.write(info.get("description", ""))
+
+        st.subheader("Strengths")
+        for s in info.get("strengths", []):
+            st.write(f"- {s}")
+
+        st.subheader("Blindspots")
+        for b in info.get("blindspots", []):
+            st.write(f"- {b}")